@@ -0,0 +1,45 @@
+"""
+Shared PostgreSQL connection helper for the environment test scripts
+
+Connection parameters come from the same POSTGRES_* variables (.env) as the
+migration scripts, so nothing is hard-coded in the tests.
+"""
+
+import os
+import psycopg2
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+DEFAULTS = {
+    'host': os.getenv('POSTGRES_HOST', 'localhost'),
+    'port': int(os.getenv('POSTGRES_PORT', '5432')),
+    'database': os.getenv('POSTGRES_DB', 'customer360'),
+    'user': os.getenv('POSTGRES_USER', 'dataeng'),
+    'password': os.getenv('POSTGRES_PASSWORD'),
+    # Never hang on a stalled connection: TCP keepalives, unacknowledged
+    # data times out after 15 s, statements are cut off after
+    # POSTGRES_STATEMENT_TIMEOUT_MS (as in reconcile.py)
+    'keepalives': 1,
+    'keepalives_idle': 30,
+    'keepalives_interval': 10,
+    'keepalives_count': 3,
+    'tcp_user_timeout': 15000,
+    'options': f"-c statement_timeout={os.getenv('POSTGRES_STATEMENT_TIMEOUT_MS', '60000')}"
+}
+
+
+def quick_connect(**overrides):
+    """
+    Open a PostgreSQL connection that fails fast
+
+    A wrong host or port errors out after 3 seconds instead of the OS
+    default (~2 minutes); the session shows up as 'c360-healthcheck'
+    in pg_stat_activity.
+    """
+    return psycopg2.connect(
+        connect_timeout=3,
+        application_name='c360-healthcheck',
+        **{**DEFAULTS, **overrides}
+    )
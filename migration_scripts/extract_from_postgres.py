@@ -1,19 +1,41 @@
 """
 Extract data from PostgreSQL to CSV files
 
-This script extracts tables from PostgreSQL and saves them as CSV files
-for later import into BigQuery.
+This script extracts tables from PostgreSQL and saves them as gzip-compressed
+CSV files ({schema}_{table}.csv.gz) for later import into BigQuery.
+No uncompressed temp files are written; BigQuery loads .csv.gz natively.
+With --format parquet, tables are written as typed Parquet files instead
+({schema}_{table}.parquet), which BigQuery loads without parsing text.
+Each export gets a {schema}_{table}.schema.json sidecar with the BigQuery
+schema derived from the PostgreSQL column types, so loads skip autodetect.
+With --format binary, tables are written in PostgreSQL's binary COPY format
+({schema}_{table}.pgcopy.gz plus a .columns.json listing the PostgreSQL
+types). This is for PostgreSQL-to-PostgreSQL round-trips only; BigQuery
+cannot load it.
 
 Usage:
     python extract_from_postgres.py --table raw.csv_customers
     python extract_from_postgres.py --all  # Extract all tables
+    python extract_from_postgres.py --all --format parquet
+    python extract_from_postgres.py --table raw.csv_customers --format binary
+    python extract_from_postgres.py --table raw.csv_orders --shards 8
 """
 
 import psycopg2
-import pandas as pd
+from psycopg2 import sql
+import pyarrow as pa
+import pyarrow.parquet as pq
+import gzip
+import io
+import json
 import os
+import queue
 import sys
+import time
+import atexit
+import decimal
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
@@ -30,13 +52,68 @@ POSTGRES_CONFIG = {
     'password': os.getenv('POSTGRES_PASSWORD', '2003')
 }
 
-# Output directory
+# Output directory (created on demand, not at import)
 OUTPUT_DIR = Path('data/exports')
 LOG_DIR = Path('logs')
 
-# Ensure directories exist
-OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-LOG_DIR.mkdir(parents=True, exist_ok=True)
+# Tables extracted concurrently (each worker holds its own connection)
+MAX_WORKERS = 8
+
+# Output file extension per --format
+FILE_EXTENSIONS = {
+    'csv': 'csv.gz',
+    'parquet': 'parquet',
+    'binary': 'pgcopy.gz',
+}
+
+# CSV sharding: one shard per ROWS_PER_SHARD rows, capped at MAX_SHARDS.
+# Shards are written as {schema}_{table}.partNNNN.csv.gz and loaded in
+# parallel by BigQuery.
+ROWS_PER_SHARD = 10_000_000
+MAX_SHARDS = 32
+
+# Rows per server-side cursor fetch / Parquet record batch
+PARQUET_BATCH_ROWS = 50000
+
+# PostgreSQL type → Arrow type for Parquet output (anything else → string).
+# numeric is mapped per column from its declared precision/scale - see
+# numeric_arrow_type()
+PG_TO_ARROW = {
+    'smallint': pa.int16(),
+    'integer': pa.int32(),
+    'bigint': pa.int64(),
+    'real': pa.float32(),
+    'double precision': pa.float64(),
+    'boolean': pa.bool_(),
+    'date': pa.date32(),
+    'time without time zone': pa.time64('us'),
+    'timestamp without time zone': pa.timestamp('us'),
+    'timestamp with time zone': pa.timestamp('us', tz='UTC'),
+}
+
+# Plain `numeric` (no declared precision/scale, e.g. AVG() results) is written
+# as decimal256(76, 38) - loaded by BigQuery as BIGNUMERIC - with values
+# rounded half-even to 38 fractional digits
+UNCONSTRAINED_NUMERIC = pa.decimal256(76, 38)
+NUMERIC_CONTEXT = decimal.Context(prec=76, rounding=decimal.ROUND_HALF_EVEN)
+NUMERIC_QUANTUM = decimal.Decimal(1).scaleb(-38)
+
+# PostgreSQL type → BigQuery type for the schema sidecar (anything else → STRING;
+# numeric is typed from its precision and scale by numeric_bq_type)
+PG_TO_BQ = {
+    'smallint': 'INT64',
+    'integer': 'INT64',
+    'bigint': 'INT64',
+    'real': 'FLOAT64',
+    'double precision': 'FLOAT64',
+    'boolean': 'BOOL',
+    'date': 'DATE',
+    'time without time zone': 'TIME',
+    'timestamp without time zone': 'TIMESTAMP',
+    'timestamp with time zone': 'TIMESTAMP',
+    'json': 'JSON',
+    'jsonb': 'JSON',
+}
 
 # Tables to extract (schema.table_name)
 TABLES_TO_EXTRACT = {
@@ -46,31 +123,59 @@ TABLES_TO_EXTRACT = {
 }
 
 
-def setup_logging():
-    """Setup logging to file and console"""
+def setup_logging(console_handler=None):
+    """
+    Setup logging to file and console
+    
+    Args:
+        console_handler: Handler for console output (default: stdout StreamHandler)
+    """
     import logging
+    import logging.handlers
+    
+    if logging.getLogger().handlers:
+        return logging.getLogger(__name__)
+    
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
     
     # Create log file with timestamp
     log_file = LOG_DIR / f"extract_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
     
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    if console_handler is None:
+        console_handler = logging.StreamHandler(sys.stdout)
+    handlers = [logging.FileHandler(log_file), console_handler]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    # Worker threads only enqueue records; one listener thread does the I/O,
+    # so parallel extracts never contend on the handler locks
+    log_queue = queue.Queue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers)
+    listener.start()
+    atexit.register(listener.stop)
+    
     # Configure logging
     logging.basicConfig(
         level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler(sys.stdout)
-        ]
+        format='%(message)s',  # final formatting happens in the listener
+        handlers=[logging.handlers.QueueHandler(log_queue)]
     )
     
     return logging.getLogger(__name__)
 
 
+def connect_postgres(**session):
+    """Open a read-only PostgreSQL connection, raising psycopg2.Error on failure"""
+    conn = psycopg2.connect(**POSTGRES_CONFIG)
+    conn.set_session(readonly=True, **session)
+    return conn
+
+
 def get_postgres_connection():
-    """Create PostgreSQL connection"""
+    """Create PostgreSQL connection (read-only: extracts never write)"""
     try:
-        conn = psycopg2.connect(**POSTGRES_CONFIG)
-        return conn
+        return connect_postgres()
     except psycopg2.Error as e:
         print(f"❌ Failed to connect to PostgreSQL: {e}")
         print(f"\nConnection parameters:")
@@ -81,6 +186,161 @@ def get_postgres_connection():
         sys.exit(1)
 
 
+def open_compressed_output(path):
+    """Open a buffered gzip writer (level 1: fast, nearly the same ratio as 6)"""
+    gz = gzip.GzipFile(filename=str(path), mode='wb', compresslevel=1, mtime=0)
+    return io.BufferedWriter(gz, buffer_size=1 << 20)
+
+
+def get_table_columns(conn, schema, table):
+    """Get (column_name, data_type) pairs in table column order"""
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT column_name, data_type
+            FROM information_schema.columns
+            WHERE table_schema = %s
+            AND table_name = %s
+            ORDER BY ordinal_position
+        """, (schema, table))
+        return cursor.fetchall()
+
+
+def get_numeric_columns(conn, schema, table):
+    """Get {column_name: (precision, scale)} for numeric columns (None if undeclared)"""
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            SELECT column_name, numeric_precision, numeric_scale
+            FROM information_schema.columns
+            WHERE table_schema = %s
+            AND table_name = %s
+            AND data_type = 'numeric'
+        """, (schema, table))
+        return {name: (precision, scale) for name, precision, scale in cursor.fetchall()}
+
+
+def numeric_arrow_type(precision, scale):
+    """Arrow decimal type for numeric(precision, scale)"""
+    if precision is None:
+        return UNCONSTRAINED_NUMERIC
+    if precision <= 38:
+        return pa.decimal128(precision, scale)
+    if precision <= 76:
+        return pa.decimal256(precision, scale)
+    return pa.string()  # wider than any Arrow/BigQuery decimal
+
+
+def numeric_bq_type(precision, scale):
+    """BigQuery type for numeric(precision, scale), matching numeric_arrow_type"""
+    if precision is not None and scale <= 9 and precision - scale <= 29:
+        return 'NUMERIC'  # fits NUMERIC(38, 9)
+    if precision is None or precision <= 76:
+        return 'BIGNUMERIC'
+    return 'STRING'
+
+
+def bigquery_types(columns, numeric_columns):
+    """BigQuery type of each (column_name, data_type) pair"""
+    return [
+        numeric_bq_type(*numeric_columns[name]) if data_type == 'numeric'
+        else PG_TO_BQ.get(data_type, 'STRING')
+        for name, data_type in columns
+    ]
+
+
+def write_schema_sidecar(columns, numeric_columns, path):
+    """Write the BigQuery JSON schema for (column_name, data_type) pairs"""
+    fields = [
+        {'name': name, 'type': bq_type, 'mode': 'NULLABLE'}
+        for (name, _), bq_type in zip(columns, bigquery_types(columns, numeric_columns))
+    ]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(fields, f, indent=2)
+
+
+def rows_to_record_batch(rows, arrow_schema):
+    """Convert a list of row tuples into an Arrow RecordBatch"""
+    arrays = []
+    for field, values in zip(arrow_schema, zip(*rows)):
+        if pa.types.is_string(field.type):
+            # json/jsonb and arrays arrive as Python objects
+            values = [
+                v if v is None or isinstance(v, str)
+                else json.dumps(v, default=str) if isinstance(v, (dict, list))
+                else str(v)
+                for v in values
+            ]
+        elif field.type == UNCONSTRAINED_NUMERIC:
+            # Undeclared scale: round to what the column type can hold
+            values = [
+                v if v is None or not v.is_finite()
+                else v.quantize(NUMERIC_QUANTUM, context=NUMERIC_CONTEXT)
+                for v in values
+            ]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=arrow_schema)
+
+
+def write_parquet(conn, schema, table, columns, numeric_columns, output_file):
+    """
+    Stream a table into a Parquet file through a server-side cursor
+    
+    Args:
+        columns: (column_name, data_type) pairs from get_table_columns
+        numeric_columns: {column_name: (precision, scale)} from get_numeric_columns
+    
+    Returns:
+        int: Number of rows written
+    """
+    arrow_schema = pa.schema([
+        (name, numeric_arrow_type(*numeric_columns[name]) if data_type == 'numeric'
+         else PG_TO_ARROW.get(data_type, pa.string()))
+        for name, data_type in columns
+    ])
+    
+    row_count = 0
+    with conn.cursor(name=f'parquet_{table}') as cursor, \
+            pq.ParquetWriter(output_file, arrow_schema, compression='snappy', use_dictionary=True) as writer:
+        cursor.itersize = PARQUET_BATCH_ROWS
+        cursor.execute(sql.SQL("SELECT * FROM {}").format(sql.Identifier(schema, table)))
+        
+        rows = cursor.fetchmany(PARQUET_BATCH_ROWS)
+        while rows:
+            writer.write_batch(rows_to_record_batch(rows, arrow_schema))
+            row_count += len(rows)
+            rows = cursor.fetchmany(PARQUET_BATCH_ROWS)
+    
+    return row_count
+
+
+def extract_shard(schema, table, shard, shards, output_file, snapshot):
+    """
+    COPY one hash shard of a table to a .csv.gz file on its own connection
+    
+    The shard reads the snapshot exported by the coordinating transaction
+    (pg_export_snapshot), so all shards see the table at the same instant.
+    Connection errors are raised, never turned into sys.exit, so a failing
+    shard fails its table only.
+    
+    Returns:
+        int: Number of rows written
+    """
+    # Hash the whole row so tables without a primary key shard too
+    query = sql.SQL(
+        "COPY (SELECT * FROM {} AS t "
+        "WHERE (hashtext(t::text) & 2147483647) % {} = {}) "
+        "TO STDOUT WITH (FORMAT CSV, HEADER TRUE)"
+    ).format(sql.Identifier(schema, table), sql.Literal(shards), sql.Literal(shard))
+    
+    conn = connect_postgres(isolation_level='REPEATABLE READ')
+    try:
+        with open_compressed_output(output_file) as f, conn.cursor() as cursor:
+            cursor.execute("SET TRANSACTION SNAPSHOT %s", (snapshot,))
+            cursor.copy_expert(query, f)
+            return cursor.rowcount
+    finally:
+        conn.close()
+
+
 def get_table_info(conn, schema, table):
     """Get basic info about a table"""
     cursor = conn.cursor()
@@ -100,37 +360,40 @@ def get_table_info(conn, schema, table):
     if not exists:
         return None
     
-    # Get row count
-    cursor.execute(f"SELECT COUNT(*) FROM {schema}.{table}")
-    row_count = cursor.fetchone()[0]
-    
-    # Get column count
-    cursor.execute("""
-        SELECT COUNT(*) 
-        FROM information_schema.columns 
-        WHERE table_schema = %s 
-        AND table_name = %s
-    """, (schema, table))
-    
-    col_count = cursor.fetchone()[0]
+    # Get estimated row count from planner statistics (a COUNT(*) would scan
+    # the whole table; the exact count comes from COPY afterwards).
+    # reltuples is -1 for tables that were never analyzed.
+    cursor.execute(
+        "SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE oid = %s::regclass",
+        (sql.Identifier(schema, table).as_string(conn),)
+    )
+    row_estimate = cursor.fetchone()[0]
     
     cursor.close()
     
+    # Get column names and types
+    columns = get_table_columns(conn, schema, table)
+    
     return {
-        'row_count': row_count,
-        'col_count': col_count
+        'row_estimate': row_estimate,
+        'col_count': len(columns),
+        'columns': columns,
+        'numeric_columns': get_numeric_columns(conn, schema, table)
     }
 
 
-def extract_table(schema, table, output_dir=None, logger=None):
+def extract_table(schema, table, output_dir=None, logger=None, file_format='csv', shards=None, conn=None):
     """
-    Extract a single table from PostgreSQL to CSV
+    Extract a single table from PostgreSQL to gzip-compressed CSV or Parquet
     
     Args:
         schema: Schema name (e.g., 'raw', 'staging', 'warehouse')
         table: Table name (e.g., 'csv_customers')
         output_dir: Output directory (default: data/exports/{schema})
         logger: Logger instance
+        file_format: 'csv' (.csv.gz), 'parquet' (.parquet) or 'binary' (.pgcopy.gz)
+        shards: Number of CSV shards (default: one per ROWS_PER_SHARD rows)
+        conn: Open connection to reuse (default: open and close a new one)
     
     Returns:
         dict: Extraction results (success, row_count, file_path, file_size)
@@ -145,21 +408,21 @@ def extract_table(schema, table, output_dir=None, logger=None):
     Path(output_dir).mkdir(parents=True, exist_ok=True)
     
     # Output file path
-    output_file = Path(output_dir) / f"{schema}_{table}.csv"
+    output_file = Path(output_dir) / f"{schema}_{table}.{FILE_EXTENSIONS[file_format]}"
     
-    logger.info(f"{'='*60}")
-    logger.info(f"Extracting: {schema}.{table}")
-    logger.info(f"{'='*60}")
+    start = time.perf_counter()
     
     try:
-        # Connect to PostgreSQL
-        conn = get_postgres_connection()
+        # Connect to PostgreSQL (unless the caller shares a connection)
+        owns_conn = conn is None
+        if owns_conn:
+            conn = get_postgres_connection()
         
         # Get table info
         info = get_table_info(conn, schema, table)
         
         if info is None:
-            logger.error(f"❌ Table {schema}.{table} does not exist")
+            logger.error(f"❌ extract {schema}.{table} failed: table does not exist")
             return {
                 'success': False,
                 'schema': schema,
@@ -167,51 +430,95 @@ def extract_table(schema, table, output_dir=None, logger=None):
                 'error': 'Table does not exist'
             }
         
-        logger.info(f"Table info: {info['row_count']:,} rows, {info['col_count']} columns")
+        # BigQuery schema sidecar, read by load_to_bigquery instead of autodetect
+        write_schema_sidecar(info['columns'], info['numeric_columns'], Path(output_dir) / f"{schema}_{table}.schema.json")
         
-        # Extract data
-        query = f"SELECT * FROM {schema}.{table}"
-        logger.info(f"Executing query: {query}")
+        if shards is None:
+            shards = min(MAX_SHARDS, info['row_estimate'] // ROWS_PER_SHARD + 1)
         
-        # Use pandas to read SQL → CSV (handles types automatically)
-        df = pd.read_sql(query, conn)
+        # Drop CSV shards left over from a previous run with a different count
+        if file_format == 'csv':
+            for stale in Path(output_dir).glob(f"{schema}_{table}.part*.csv.gz"):
+                stale.unlink()
         
-        logger.info(f"✅ Extracted {len(df):,} rows to DataFrame")
+        output_files = [output_file]
         
-        # Save to CSV
-        df.to_csv(output_file, index=False, encoding='utf-8')
+        if file_format == 'parquet':
+            # Extract data: server-side cursor batches → Arrow → Parquet
+            row_count = write_parquet(conn, schema, table, info['columns'], info['numeric_columns'], output_file)
+        elif file_format == 'binary':
+            # Extract data: binary COPY skips text formatting of every value
+            # (COPY (SELECT ...) so dbt views can be exported too)
+            query = sql.SQL("COPY (SELECT * FROM {}) TO STDOUT WITH (FORMAT BINARY)").format(
+                sql.Identifier(schema, table)
+            )
+            
+            with open_compressed_output(output_file) as f, conn.cursor() as cursor:
+                cursor.copy_expert(query, f)
+                row_count = cursor.rowcount if cursor.rowcount >= 0 else info['row_estimate']
+            
+            # Column order and PostgreSQL types needed to decode the binary rows
+            columns_file = Path(output_dir) / f"{schema}_{table}.columns.json"
+            with open(columns_file, 'w', encoding='utf-8') as f:
+                json.dump([{'name': name, 'type': data_type} for name, data_type in info['columns']], f, indent=2)
+        elif shards > 1:
+            # Extract data: one COPY per hash shard, each on its own connection,
+            # all reading this transaction's snapshot (kept open until they finish)
+            output_file.unlink(missing_ok=True)
+            output_files = [
+                Path(output_dir) / f"{schema}_{table}.part{k:04d}.csv.gz"
+                for k in range(shards)
+            ]
+            
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT pg_export_snapshot()")
+                snapshot = cursor.fetchone()[0]
+            
+            with ThreadPoolExecutor(max_workers=min(shards, MAX_WORKERS)) as executor:
+                row_count = sum(executor.map(
+                    lambda k: extract_shard(schema, table, k, shards, output_files[k], snapshot),
+                    range(shards)
+                ))
+            
+            output_file = Path(output_dir) / f"{schema}_{table}.part*.csv.gz"
+        else:
+            # Extract data: COPY streams rows from the server straight to disk
+            query = sql.SQL("COPY (SELECT * FROM {}) TO STDOUT WITH (FORMAT CSV, HEADER TRUE)").format(
+                sql.Identifier(schema, table)
+            )
+            
+            with open_compressed_output(output_file) as f, conn.cursor() as cursor:
+                cursor.copy_expert(query, f)
+                row_count = cursor.rowcount if cursor.rowcount >= 0 else info['row_estimate']
         
         # Get file size
-        file_size = output_file.stat().st_size
+        file_size = sum(f.stat().st_size for f in output_files)
         file_size_mb = file_size / (1024 * 1024)
         
-        logger.info(f"✅ Saved to: {output_file}")
-        logger.info(f"   File size: {file_size_mb:.2f} MB ({file_size:,} bytes)")
-        logger.info(f"   Rows: {len(df):,}")
-        logger.info(f"   Columns: {len(df.columns)}")
-        
         # Close connection
-        conn.close()
+        if owns_conn:
+            conn.close()
         
-        logger.info(f"{'='*60}")
-        logger.info(f"✅ SUCCESS: {schema}.{table}")
-        logger.info(f"{'='*60}\n")
+        # One record per table keeps logging off the hot path
+        logger.info(
+            "✅ extract %s.%s rows=%d cols=%d files=%d size=%.2fMB elapsed=%.2fs → %s",
+            schema, table, row_count, info['col_count'], len(output_files),
+            file_size_mb, time.perf_counter() - start, output_file
+        )
         
         return {
             'success': True,
             'schema': schema,
             'table': table,
-            'row_count': len(df),
-            'col_count': len(df.columns),
+            'row_count': row_count,
+            'col_count': info['col_count'],
             'file_path': str(output_file),
             'file_size_bytes': file_size,
             'file_size_mb': file_size_mb
         }
         
     except Exception as e:
-        logger.error(f"❌ FAILED: {schema}.{table}")
-        logger.error(f"   Error: {str(e)}")
-        logger.error(f"{'='*60}\n")
+        logger.error(f"❌ extract {schema}.{table} failed: {e}")
         
         return {
             'success': False,
@@ -221,7 +528,63 @@ def extract_table(schema, table, output_dir=None, logger=None):
         }
 
 
-def extract_all_tables(logger=None):
+def release_connection(conn, logger):
+    """
+    End the read-only transaction of a pooled connection before reuse
+    
+    A connection that died mid-table (or a None slot left by a failed
+    reconnect) is replaced by a fresh one, so the failure stays with that
+    table instead of every later one on the worker.
+    
+    Returns:
+        The connection to put back in the pool (None if reconnecting failed)
+    """
+    try:
+        if conn is not None and not conn.closed:
+            conn.rollback()
+            return conn
+    except psycopg2.Error as e:
+        logger.warning(f"⚠️  Dropping broken PostgreSQL connection: {e}")
+        conn.close()
+    
+    try:
+        return connect_postgres()
+    except psycopg2.Error as e:
+        logger.error(f"❌ Failed to reconnect to PostgreSQL: {e}")
+        return None
+
+
+def extract_tables(tasks, logger=None, file_format='csv', shards=None):
+    """Extract (schema, table) pairs concurrently, results in input order"""
+    workers = max(1, min(MAX_WORKERS, len(tasks)))
+    
+    # One connection per worker, reused for every table that worker extracts
+    pool = queue.Queue()
+    for _ in range(workers):
+        pool.put(get_postgres_connection())
+    
+    def run(task):
+        conn = pool.get()
+        try:
+            if conn is None:
+                schema, table = task
+                logger.error(f"❌ extract {schema}.{table} failed: no PostgreSQL connection")
+                return {'success': False, 'schema': schema, 'table': table, 'error': 'No PostgreSQL connection'}
+            return extract_table(*task, logger=logger, file_format=file_format, shards=shards, conn=conn)
+        finally:
+            pool.put(release_connection(conn, logger))
+    
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(run, tasks))
+    finally:
+        while not pool.empty():
+            conn = pool.get()
+            if conn is not None:
+                conn.close()
+
+
+def extract_all_tables(logger=None, file_format='csv', shards=None):
     """Extract all tables defined in TABLES_TO_EXTRACT"""
     if logger is None:
         logger = setup_logging()
@@ -230,12 +593,8 @@ def extract_all_tables(logger=None):
     logger.info("EXTRACTING ALL TABLES")
     logger.info("="*60 + "\n")
     
-    results = []
-    
-    for schema, tables in TABLES_TO_EXTRACT.items():
-        for table in tables:
-            result = extract_table(schema, table, logger=logger)
-            results.append(result)
+    tasks = [(schema, table) for schema, tables in TABLES_TO_EXTRACT.items() for table in tables]
+    results = extract_tables(tasks, logger=logger, file_format=file_format, shards=shards)
     
     # Summary
     logger.info("\n" + "="*60)
@@ -289,6 +648,17 @@ def main():
         '--schema',
         help='Extract all tables from a specific schema'
     )
+    parser.add_argument(
+        '--format',
+        choices=list(FILE_EXTENSIONS),
+        default='csv',
+        help='Output format: gzip CSV (default), Parquet, or PostgreSQL binary COPY (not loadable into BigQuery)'
+    )
+    parser.add_argument(
+        '--shards',
+        type=int,
+        help=f'Split each CSV extract into N files (default: one per {ROWS_PER_SHARD:,} rows, max {MAX_SHARDS})'
+    )
     
     args = parser.parse_args()
     
@@ -305,7 +675,7 @@ def main():
     # Extract based on arguments
     if args.all:
         # Extract all tables
-        results = extract_all_tables(logger)
+        results = extract_all_tables(logger, file_format=args.format, shards=args.shards)
         
     elif args.schema:
         # Extract all tables from specific schema
@@ -314,10 +684,8 @@ def main():
             logger.error(f"   Available schemas: {list(TABLES_TO_EXTRACT.keys())}")
             sys.exit(1)
         
-        results = []
-        for table in TABLES_TO_EXTRACT[args.schema]:
-            result = extract_table(args.schema, table, logger=logger)
-            results.append(result)
+        tasks = [(args.schema, table) for table in TABLES_TO_EXTRACT[args.schema]]
+        results = extract_tables(tasks, logger=logger, file_format=args.format, shards=args.shards)
         
     elif args.table:
         # Extract single table
@@ -327,7 +695,7 @@ def main():
             sys.exit(1)
         
         schema, table = args.table.split('.', 1)
-        result = extract_table(schema, table, logger=logger)
+        result = extract_table(schema, table, logger=logger, file_format=args.format, shards=args.shards)
         results = [result]
         
     else:
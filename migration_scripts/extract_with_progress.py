@@ -3,25 +3,76 @@ Extract with Progress Bar
 Enhanced version with tqdm progress bars for better UX
 """
 
-from extract_from_postgres import *
+from extract_from_postgres import (
+    OUTPUT_DIR,
+    setup_logging,
+    get_postgres_connection,
+    get_table_info,
+    open_compressed_output,
+    write_schema_sidecar,
+)
+from psycopg2 import sql
 from tqdm import tqdm
-import time
+from pathlib import Path
+import io
+import json
+import logging
+import sys
+
+
+# Rows fetched per round-trip from the server-side cursor
+ITERSIZE = 50000
+
+
+class TqdmLoggingHandler(logging.StreamHandler):
+    """Console handler that writes through tqdm so log lines never break the progress bar"""
+    
+    def emit(self, record):
+        try:
+            tqdm.write(self.format(record), file=self.stream)
+        except Exception:
+            self.handleError(record)
+
+
+def setup_progress_logging():
+    """Setup logging with the console on stderr, shared with the progress bar"""
+    return setup_logging(console_handler=TqdmLoggingHandler(sys.stderr))
+
+
+def to_csv_field(value):
+    """
+    Format one value as COPY ... (FORMAT CSV) does: NULL is an empty unquoted
+    field, everything else is quoted, so '' stays distinct from NULL
+    """
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        # json/jsonb and arrays arrive as Python objects
+        value = json.dumps(value, default=str)
+    elif not isinstance(value, str):
+        value = str(value)
+    return '"' + value.replace('"', '""') + '"'
+
+
+def to_csv_lines(rows):
+    """Format a batch of row tuples as CSV text"""
+    return ''.join(','.join(map(to_csv_field, row)) + '\n' for row in rows)
 
 
 def extract_table_with_progress(schema, table, output_dir=None, logger=None):
     """Extract table with progress bar"""
     if logger is None:
-        logger = setup_logging()
+        logger = setup_progress_logging()
     
     if output_dir is None:
         output_dir = OUTPUT_DIR / schema
     
     Path(output_dir).mkdir(parents=True, exist_ok=True)
-    output_file = Path(output_dir) / f"{schema}_{table}.csv"
+    output_file = Path(output_dir) / f"{schema}_{table}.csv.gz"
     
-    print(f"\n{'='*60}")
-    print(f"Extracting: {schema}.{table}")
-    print(f"{'='*60}")
+    logger.info(f"{'='*60}")
+    logger.info(f"Extracting: {schema}.{table}")
+    logger.info(f"{'='*60}")
     
     try:
         conn = get_postgres_connection()
@@ -30,39 +81,52 @@ def extract_table_with_progress(schema, table, output_dir=None, logger=None):
         info = get_table_info(conn, schema, table)
         
         if info is None:
-            print(f"❌ Table {schema}.{table} does not exist")
+            logger.error(f"❌ Table {schema}.{table} does not exist")
             return {'success': False, 'error': 'Table does not exist'}
         
-        print(f"Table: {info['row_count']:,} rows, {info['col_count']} columns")
+        logger.info(f"Table: ~{info['row_estimate']:,} rows (approx), {info['col_count']} columns")
+        
+        # Drop CSV shards left by a sharded extract_table run, so the loader
+        # does not pick them up next to the single file written here
+        for stale in Path(output_dir).glob(f"{schema}_{table}.part*.csv.gz"):
+            stale.unlink()
+        write_schema_sidecar(info['columns'], info['numeric_columns'], Path(output_dir) / f"{schema}_{table}.schema.json")
         
         # Extract with progress bar
-        query = f"SELECT * FROM {schema}.{table}"
+        # Named (server-side) cursor streams ITERSIZE rows at a time, so
+        # memory stays bounded and the bar counts real rows
+        query = sql.SQL("SELECT * FROM {}").format(sql.Identifier(schema, table))
         
-        print("Extracting data...")
-        with tqdm(total=info['row_count'], desc="Reading rows", unit=" rows") as pbar:
-            # Use chunksize for progress updates on large tables
-            chunks = []
-            for chunk in pd.read_sql(query, conn, chunksize=1000):
-                chunks.append(chunk)
-                pbar.update(len(chunk))
+        logger.info("Extracting data...")
+        with tqdm(total=info['row_estimate'], desc="Writing CSV (approx total)", unit=" rows") as pbar, \
+                open_compressed_output(output_file) as buf, \
+                io.TextIOWrapper(buf, encoding='utf-8', newline='') as f, \
+                conn.cursor(name=f'extract_{table}') as cursor:
+            cursor.itersize = ITERSIZE
+            cursor.execute(query)
             
-            df = pd.concat(chunks, ignore_index=True)
-        
-        print(f"✅ Extracted {len(df):,} rows")
+            # Write each batch as soon as it arrives - nothing is accumulated
+            row_count = 0
+            batch = cursor.fetchmany(ITERSIZE)
+            f.write(to_csv_lines([[desc[0] for desc in cursor.description]]))
+            while batch:
+                f.write(to_csv_lines(batch))
+                row_count += len(batch)
+                pbar.update(len(batch))
+                batch = cursor.fetchmany(ITERSIZE)
+            
+            # Replace the planner estimate with the exact count
+            pbar.total = row_count
+            pbar.refresh()
         
-        # Save to CSV with progress
-        print("Writing to CSV...")
-        with tqdm(total=len(df), desc="Writing CSV", unit=" rows") as pbar:
-            # Write in chunks for progress
-            df.to_csv(output_file, index=False, encoding='utf-8')
-            pbar.update(len(df))
+        logger.info(f"✅ Extracted {row_count:,} rows")
         
         file_size = output_file.stat().st_size
         file_size_mb = file_size / (1024 * 1024)
         
-        print(f"✅ Saved to: {output_file}")
-        print(f"   Size: {file_size_mb:.2f} MB")
-        print(f"{'='*60}\n")
+        logger.info(f"✅ Saved to: {output_file}")
+        logger.info(f"   Size: {file_size_mb:.2f} MB")
+        logger.info(f"{'='*60}\n")
         
         conn.close()
         
@@ -70,22 +134,24 @@ def extract_table_with_progress(schema, table, output_dir=None, logger=None):
             'success': True,
             'schema': schema,
             'table': table,
-            'row_count': len(df),
+            'row_count': row_count,
             'file_path': str(output_file),
             'file_size_mb': file_size_mb
         }
         
     except Exception as e:
-        print(f"❌ Error: {e}")
+        logger.error(f"❌ Error: {e}")
         return {'success': False, 'error': str(e)}
 
 
 if __name__ == '__main__':
+    logger = setup_progress_logging()
+    
     # Test with single table
-    result = extract_table_with_progress('raw', 'csv_customers')
+    result = extract_table_with_progress('raw', 'csv_customers', logger=logger)
     
     if result['success']:
-        print("\n🎉 Extraction successful!")
+        logger.info("\n🎉 Extraction successful!")
     else:
-        print("\n❌ Extraction failed!")
+        logger.error("\n❌ Extraction failed!")
         sys.exit(1)
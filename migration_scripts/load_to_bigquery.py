@@ -1,20 +1,37 @@
 """
-Load CSV files to BigQuery
+Load CSV / Parquet files to BigQuery
 
-This script loads CSV files (extracted from PostgreSQL) into BigQuery tables.
+This script loads files extracted from PostgreSQL into BigQuery tables.
+Gzip-compressed CSVs (.csv.gz, as written by the extract script) are loaded
+as-is; BigQuery decompresses them server-side. Parquet files (.parquet,
+from --format parquet) carry their own column types, so no schema detection
+or CSV parsing happens on the BigQuery side.
+CSV loads use the {schema}_{table}.schema.json sidecar written by the extract
+script when present. Without it, column types are guessed locally from the
+header and first data row, so BigQuery never runs schema autodetection.
 
 Usage:
-    python load_to_bigquery.py --file data/exports/raw/raw_csv_customers.csv --table raw_data.csv_customers
-    python load_to_bigquery.py --schema raw  # Load all CSV files from schema
-    python load_to_bigquery.py --all  # Load all CSV files
+    python load_to_bigquery.py --file data/exports/raw/raw_csv_customers.csv.gz --table raw_data.csv_customers
+    python load_to_bigquery.py --file data/exports/raw/raw_csv_customers.parquet --table raw_data.csv_customers
+    python load_to_bigquery.py --file 'data/exports/raw/raw_csv_orders.part*.csv.gz' --table raw_data.csv_orders
+    python load_to_bigquery.py --schema raw  # Load all exported files from schema
+    python load_to_bigquery.py --all  # Load all exported files
 """
 
+import csv
+import glob
+import gzip
 import os
 import sys
+import threading
 import argparse
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from itertools import islice
 from pathlib import Path
 from google.cloud import bigquery
+from google.cloud import storage
+from google.cloud.storage import transfer_manager
 from google.cloud.exceptions import NotFound
 from dotenv import load_dotenv
 from tqdm import tqdm
@@ -39,10 +56,26 @@ if not GCP_PROJECT_ID:
         print("❌ GCP_PROJECT_ID not found in .env or gcloud config")
         sys.exit(1)
 
+# Optional GCS staging bucket: when set, files are uploaded to GCS and
+# loaded with load_table_from_uri instead of streamed through the client
+GCS_STAGING_BUCKET = os.getenv('GCS_STAGING_BUCKET')
+
+# Uploads above this size are split into chunks sent in parallel
+GCS_CHUNK_SIZE = 16 * 1024 * 1024
+
 # Directories
 EXPORTS_DIR = Path('data/exports')
 LOG_DIR = Path('logs')
 
+# Load jobs run concurrently (each mostly waits on BigQuery)
+MAX_WORKERS = 8
+
+# One BigQuery and one GCS client for the whole run, and datasets already verified
+_CLIENT = None
+_STORAGE_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+_DATASET_CACHE = set()
+
 # Schema mapping: PostgreSQL schema → BigQuery dataset
 SCHEMA_MAPPING = {
     'raw': 'raw_data',
@@ -71,10 +104,13 @@ def setup_logging():
 
 
 def get_bigquery_client():
-    """Create BigQuery client"""
+    """Get the shared BigQuery client (created on first use)"""
+    global _CLIENT
     try:
-        client = bigquery.Client(project=GCP_PROJECT_ID)
-        return client
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = bigquery.Client(project=GCP_PROJECT_ID)
+        return _CLIENT
     except Exception as e:
         print(f"❌ Failed to create BigQuery client: {e}")
         print("\nTroubleshooting:")
@@ -84,36 +120,116 @@ def get_bigquery_client():
         sys.exit(1)
 
 
+def get_storage_client():
+    """Get the shared GCS client used for staging (created on first use)"""
+    global _STORAGE_CLIENT
+    with _CLIENT_LOCK:
+        if _STORAGE_CLIENT is None:
+            _STORAGE_CLIENT = storage.Client(project=GCP_PROJECT_ID)
+    return _STORAGE_CLIENT
+
+
 def dataset_exists(client, dataset_id):
-    """Check if dataset exists"""
+    """Check if dataset exists (positive results are cached for the run)"""
+    if dataset_id in _DATASET_CACHE:
+        return True
     try:
         client.get_dataset(dataset_id)
+        _DATASET_CACHE.add(dataset_id)
         return True
     except NotFound:
         return False
 
 
-def load_csv_to_bigquery(
-    csv_path,
+def stage_to_gcs(source_path, prefix, file_size):
+    """Upload a file (file_size bytes) to the GCS staging bucket and return its Blob"""
+    bucket = get_storage_client().bucket(GCS_STAGING_BUCKET)
+    blob = bucket.blob(f"{prefix}/{source_path.name}")
+    
+    if file_size > GCS_CHUNK_SIZE:
+        transfer_manager.upload_chunks_concurrently(
+            str(source_path),
+            blob,
+            chunk_size=GCS_CHUNK_SIZE,
+            worker_type=transfer_manager.THREAD
+        )
+    else:
+        blob.upload_from_filename(str(source_path), timeout=600)
+    
+    return blob
+
+
+def schema_sidecar_path(source_path):
+    """Sidecar schema written by the extract script: {schema}_{table}.schema.json"""
+    return source_path.parent / f"{source_path.name.split('.', 1)[0]}.schema.json"
+
+
+def infer_value_type(value):
+    """Best-effort BigQuery type for a single CSV value"""
+    for cast, bq_type in ((int, 'INT64'), (float, 'FLOAT64'), (date.fromisoformat, 'DATE')):
+        try:
+            cast(value)
+            return bq_type
+        except ValueError:
+            pass
+    return 'STRING'
+
+
+def infer_schema_from_head(path):
+    """
+    Build a CSV schema from the header and first data row only
+    
+    Fallback for exports without a .schema.json sidecar. Empty values
+    (NULLs) and anything not parsing as int/float/date become STRING.
+    
+    Returns:
+        list: SchemaField list, or None if the file has no header
+    """
+    path = Path(path)
+    opener = gzip.open if path.suffix == '.gz' else open
+    with opener(path, 'rt', encoding='utf-8', newline='') as f:
+        head = list(islice(csv.reader(f), 2))
+    
+    if not head:
+        return None
+    
+    header = head[0]
+    first_row = head[1] if len(head) > 1 else [''] * len(header)
+    
+    return [
+        bigquery.SchemaField(name, infer_value_type(value) if value else 'STRING')
+        for name, value in zip(header, first_row)
+    ]
+
+
+def submit_load(
+    source_path,
     dataset_id,
     table_id,
     project_id=None,
     write_disposition='WRITE_TRUNCATE',
-    logger=None
+    logger=None,
+    file_sizes=None
 ):
     """
-    Load CSV file to BigQuery table
+    Start loading an exported file (or all shards of one table) into BigQuery
+    
+    Returns once the data is uploaded and the load job is running; pass the
+    result to wait_load() to block until the job finishes.
     
     Args:
-        csv_path: Path to CSV file
+        source_path: Path to export file (.csv, .csv.gz or .parquet),
+            or a list of shard paths ({schema}_{table}.partNNNN.csv.gz)
         dataset_id: BigQuery dataset ID (e.g., 'raw_data')
         table_id: BigQuery table ID (e.g., 'csv_customers')
         project_id: GCP project ID (default: from config)
         write_disposition: WRITE_TRUNCATE (overwrite) or WRITE_APPEND
         logger: Logger instance
+        file_sizes: {Path: size in bytes} if the caller already stat'ed the files
     
     Returns:
-        dict: Load results
+        dict: Submitted job ('success', 'job', 'client', 'table_ref',
+            'staged_blobs') or error
     """
     if logger is None:
         logger = setup_logging()
@@ -121,24 +237,32 @@ def load_csv_to_bigquery(
     if project_id is None:
         project_id = GCP_PROJECT_ID
     
-    csv_path = Path(csv_path)
+    if isinstance(source_path, (list, tuple)):
+        source_paths = sorted(Path(p) for p in source_path)
+    else:
+        source_paths = [Path(source_path)]
+    source_path = source_paths[0]
+    is_parquet = source_path.suffix == '.parquet'
     
     logger.info(f"{'='*60}")
-    logger.info(f"Loading: {csv_path.name}")
+    logger.info(f"Loading: {source_path.name}" + (f" (+{len(source_paths) - 1} shards)" if len(source_paths) > 1 else ""))
     logger.info(f"{'='*60}")
     
-    # Check if CSV exists
-    if not csv_path.exists():
-        logger.error(f"❌ CSV file not found: {csv_path}")
-        return {
-            'success': False,
-            'error': 'File not found'
-        }
+    # Check if files exist and get their size (skipped when the caller already has it)
+    if file_sizes is None:
+        missing = [p for p in source_paths if not p.exists()]
+        if missing:
+            logger.error(f"❌ File not found: {missing[0]}")
+            return {
+                'success': False,
+                'error': 'File not found'
+            }
+        
+        file_sizes = {p: p.stat().st_size for p in source_paths}
     
-    # Get file size
-    file_size = csv_path.stat().st_size
+    file_size = sum(file_sizes[p] for p in source_paths)
     file_size_mb = file_size / (1024 * 1024)
-    logger.info(f"CSV file: {csv_path}")
+    logger.info(f"Source file: {source_path}")
     logger.info(f"File size: {file_size_mb:.2f} MB ({file_size:,} bytes)")
     
     try:
@@ -159,38 +283,133 @@ def load_csv_to_bigquery(
         logger.info(f"Target table: {table_ref}")
         
         # Configure load job
-        job_config = bigquery.LoadJobConfig(
-            source_format=bigquery.SourceFormat.CSV,
-            skip_leading_rows=1,  # Skip header row
-            autodetect=True,      # Auto-detect schema from CSV
-            write_disposition=write_disposition,  # Overwrite or append
-            allow_quoted_newlines=True,  # Handle newlines in quoted fields
-            allow_jagged_rows=False,  # Fail if row has wrong number of columns
-            max_bad_records=0  # Fail on any bad record
-        )
-        
-        logger.info(f"Load configuration:")
-        logger.info(f"  - Source format: CSV")
-        logger.info(f"  - Skip header: Yes")
-        logger.info(f"  - Schema detection: Auto")
-        logger.info(f"  - Write mode: {write_disposition}")
+        if is_parquet:
+            # Parquet is self-describing: no header, no schema detection.
+            # Decimals become NUMERIC when they fit, else BIGNUMERIC (the
+            # default target is NUMERIC only, which rejects wider decimals)
+            job_config = bigquery.LoadJobConfig(
+                source_format=bigquery.SourceFormat.PARQUET,
+                write_disposition=write_disposition,
+                decimal_target_types=[
+                    bigquery.DecimalTargetType.NUMERIC,
+                    bigquery.DecimalTargetType.BIGNUMERIC,
+                    bigquery.DecimalTargetType.STRING,
+                ]
+            )
+            
+            logger.info(f"Load configuration:")
+            logger.info(f"  - Source format: PARQUET")
+            logger.info(f"  - Schema: from Parquet file")
+            logger.info(f"  - Write mode: {write_disposition}")
+        else:
+            # Explicit schema from the PostgreSQL catalog when available,
+            # otherwise inferred from the file head (no server-side autodetect)
+            sidecar = schema_sidecar_path(source_path)
+            if sidecar.exists():
+                schema = client.schema_from_json(str(sidecar))
+                schema_source = f"from {sidecar.name}"
+            else:
+                schema = infer_schema_from_head(source_path)
+                schema_source = "inferred from file head"
+            
+            job_config = bigquery.LoadJobConfig(
+                source_format=bigquery.SourceFormat.CSV,
+                skip_leading_rows=1,  # Skip header row
+                schema=schema,
+                autodetect=schema is None,  # Auto-detect only for a headerless file
+                write_disposition=write_disposition,  # Overwrite or append
+                allow_quoted_newlines=True,  # Handle newlines in quoted fields
+                allow_jagged_rows=False,  # Fail if row has wrong number of columns
+                max_bad_records=0  # Fail on any bad record
+            )
+            
+            logger.info(f"Load configuration:")
+            logger.info(f"  - Source format: CSV{' (gzip)' if source_path.suffix == '.gz' else ''}")
+            logger.info(f"  - Skip header: Yes")
+            logger.info(f"  - Schema: {schema_source if schema else 'Auto-detected'}")
+            logger.info(f"  - Write mode: {write_disposition}")
         
-        # Load CSV
+        # Load file
         logger.info(f"Starting load job...")
         
-        with open(csv_path, 'rb') as source_file:
-            load_job = client.load_table_from_file(
-                source_file,
+        staged_blobs = []
+        if GCS_STAGING_BUCKET:
+            # Upload once to GCS, then BigQuery reads it inside Google's network.
+            # All shards go into one job, which BigQuery loads in parallel.
+            staged_blobs = [stage_to_gcs(p, dataset_id, file_sizes[p]) for p in source_paths]
+            source_uris = [f"gs://{GCS_STAGING_BUCKET}/{blob.name}" for blob in staged_blobs]
+            logger.info(f"Staged to: {source_uris[0]}" + (f" (+{len(source_uris) - 1} shards)" if len(source_uris) > 1 else ""))
+            
+            load_job = client.load_table_from_uri(
+                source_uris,
                 table_ref,
                 job_config=job_config
             )
+        else:
+            # Without staging each file is its own job; shards after the first append
+            for i, path in enumerate(source_paths):
+                if i > 0:
+                    load_job.result()
+                    job_config.write_disposition = 'WRITE_APPEND'
+                
+                with open(path, 'rb') as source_file:
+                    load_job = client.load_table_from_file(
+                        source_file,
+                        table_ref,
+                        job_config=job_config
+                    )
         
-        # Wait for job to complete
         logger.info(f"Job ID: {load_job.job_id}")
-        logger.info(f"Waiting for job to complete...")
+        
+        return {
+            'success': True,
+            'job': load_job,
+            'client': client,
+            'table_ref': table_ref,
+            'staged_blobs': staged_blobs
+        }
+        
+    except Exception as e:
+        logger.error(f"❌ Load failed: {str(e)}")
+        logger.error(f"{'='*60}\n")
+        
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
+
+def wait_load(submitted, logger=None):
+    """
+    Wait for a load job started by submit_load() and report the table
+    
+    Returns:
+        dict: Load results
+    """
+    if logger is None:
+        logger = setup_logging()
+    
+    if not submitted['success']:
+        return submitted
+    
+    load_job = submitted['job']
+    client = submitted['client']
+    table_ref = submitted['table_ref']
+    
+    try:
+        # Wait for job to complete
+        logger.info(f"Waiting for job {load_job.job_id} ({table_ref})...")
         
         load_job.result()  # Wait for completion
         
+        # The staged copies are no longer needed once the data is in BigQuery
+        # (kept after a failure so the load can be retried from GCS)
+        for blob in submitted.get('staged_blobs', []):
+            try:
+                blob.delete()
+            except Exception as e:
+                logger.warning(f"⚠️  Could not delete staged file {blob.name}: {e}")
+        
         # Get table info
         table = client.get_table(table_ref)
         
@@ -228,8 +447,22 @@ def load_csv_to_bigquery(
         }
 
 
-def load_schema_csvs(schema, logger=None):
-    """Load all CSV files from a PostgreSQL schema"""
+def load_to_bigquery(source_path, dataset_id, table_id, project_id=None,
+                     write_disposition='WRITE_TRUNCATE', logger=None):
+    """Load an exported file (or all shards of one table) and wait for it"""
+    submitted = submit_load(
+        source_path,
+        dataset_id,
+        table_id,
+        project_id=project_id,
+        write_disposition=write_disposition,
+        logger=logger
+    )
+    return wait_load(submitted, logger=logger)
+
+
+def submit_schema_loads(schema, logger=None):
+    """Submit load jobs for all exported files (CSV or Parquet) of a PostgreSQL schema"""
     if logger is None:
         logger = setup_logging()
     
@@ -246,45 +479,70 @@ def load_schema_csvs(schema, logger=None):
         logger.error(f"❌ Directory not found: {csv_dir}")
         return []
     
-    csv_files = list(csv_dir.glob('*.csv'))
+    # One directory scan; DirEntry caches its stat() result
+    with os.scandir(csv_dir) as entries:
+        csv_files = [
+            entry for entry in entries
+            if entry.name.endswith(('.csv.gz', '.parquet'))
+        ]
     
     if not csv_files:
-        logger.warning(f"⚠️  No CSV files found in {csv_dir}")
+        logger.warning(f"⚠️  No export files found in {csv_dir}")
         return []
     
-    logger.info(f"\nFound {len(csv_files)} CSV file(s) in {schema}/")
+    logger.info(f"\nFound {len(csv_files)} export file(s) in {schema}/")
     
-    results = []
+    exports = {}
     
     for csv_file in csv_files:
         # Extract table name from filename
-        # Format: {schema}_{table}.csv → table
-        filename = csv_file.stem  # raw_csv_customers
+        # Format: {schema}_{table}[.partNNNN].csv.gz / .parquet → table
+        filename = csv_file.name.split('.', 1)[0]  # raw_csv_customers
         if filename.startswith(f"{schema}_"):
             table_id = filename[len(schema)+1:]  # csv_customers
         else:
             table_id = filename
         
-        result = load_csv_to_bigquery(
-            csv_path=csv_file,
-            dataset_id=dataset_id,
-            table_id=table_id,
-            logger=logger
-        )
-        
-        results.append(result)
+        exports.setdefault(table_id, []).append(csv_file)
     
-    return results
+    jobs = {}
+    
+    for table_id, files in exports.items():
+        # Both formats present for a table: load the most recent export
+        newest = max(files, key=lambda f: f.stat().st_mtime)
+        is_parquet = newest.name.endswith('.parquet')
+        jobs[table_id] = [f for f in files if f.name.endswith('.parquet') == is_parquet]
+    
+    # Uploads run in parallel threads; the jobs then run concurrently server-side
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = [
+            executor.submit(
+                submit_load,
+                source_path=[f.path for f in files],
+                dataset_id=dataset_id,
+                table_id=table_id,
+                logger=logger,
+                file_sizes={Path(f.path): f.stat().st_size for f in files}
+            )
+            for table_id, files in jobs.items()
+        ]
+        return [future.result() for future in futures]
+
+
+def load_schema_csvs(schema, logger=None):
+    """Load all exported files (CSV or Parquet) from a PostgreSQL schema"""
+    submitted = submit_schema_loads(schema, logger=logger)
+    return [wait_load(job, logger=logger) for job in submitted]
 
 
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
-        description='Load CSV files to BigQuery'
+        description='Load CSV / Parquet files to BigQuery'
     )
     parser.add_argument(
         '--file',
-        help='CSV file to load'
+        help='CSV (.csv/.csv.gz) or Parquet file to load'
     )
     parser.add_argument(
         '--table',
@@ -323,8 +581,11 @@ def main():
         
         dataset_id, table_id = args.table.split('.', 1)
         
-        result = load_csv_to_bigquery(
-            csv_path=args.file,
+        # A glob pattern selects every shard of a sharded extract
+        source_path = sorted(glob.glob(args.file)) or args.file
+        
+        result = load_to_bigquery(
+            source_path=source_path,
             dataset_id=dataset_id,
             table_id=table_id,
             logger=logger
@@ -337,10 +598,13 @@ def main():
         results = load_schema_csvs(args.schema, logger=logger)
         
     elif args.all:
-        # Load all CSV files from all schemas
+        # Load all CSV files from all schemas: submit every job first, then
+        # wait, so BigQuery runs the loads of all schemas concurrently
+        submitted = []
         for schema in SCHEMA_MAPPING.keys():
-            schema_results = load_schema_csvs(schema, logger=logger)
-            results.extend(schema_results)
+            submitted.extend(submit_schema_loads(schema, logger=logger))
+        
+        results = [wait_load(job, logger=logger) for job in submitted]
         
     else:
         # No arguments - show help
@@ -0,0 +1,346 @@
+"""
+Migrate PostgreSQL tables to BigQuery with the Storage Write API
+
+Rows flow straight from a server-side PostgreSQL cursor into a PENDING
+BigQuery write stream - no CSV/Parquet file on disk, no load job. Rows are
+streamed into a staging table built from the PostgreSQL column types; once the
+stream is committed, a copy job replaces the destination table with it in one
+step, so the live table is never empty or half-written.
+
+Usage:
+    python migrate_streaming.py --table raw.csv_customers
+    python migrate_streaming.py --schema raw  # Migrate all tables from schema
+"""
+
+import sys
+import json
+import argparse
+from collections import deque
+from datetime import datetime, date, timezone, timedelta
+from pathlib import Path
+from google.cloud import bigquery
+from google.cloud import bigquery_storage_v1
+from google.cloud.bigquery_storage_v1 import types, writer
+from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+from psycopg2 import sql
+
+from extract_from_postgres import (
+    NUMERIC_CONTEXT,
+    NUMERIC_QUANTUM,
+    TABLES_TO_EXTRACT,
+    bigquery_types,
+    get_postgres_connection,
+    get_table_info,
+)
+from load_to_bigquery import GCP_PROJECT_ID, SCHEMA_MAPPING, get_bigquery_client
+
+LOG_DIR = Path('logs')
+
+# Rows per server-side cursor fetch
+FETCH_ROWS = 10000
+
+# Serialized row bytes per AppendRows request (the API limit is 10 MB
+# per request, proto framing included)
+APPEND_MAX_BYTES = 8 * 1024 * 1024
+
+# AppendRows requests awaiting a response before sending blocks on the oldest
+MAX_IN_FLIGHT = 8
+
+# Suffix of the table rows are streamed into before the swap
+STAGING_SUFFIX = '__streaming'
+
+# BigQuery type → proto field type used in the write stream schema.
+# NUMERIC, BIGNUMERIC, DATETIME, TIME and JSON are sent as their string form.
+FieldType = descriptor_pb2.FieldDescriptorProto
+BQ_TO_PROTO = {
+    'INT64': FieldType.TYPE_INT64,
+    'FLOAT64': FieldType.TYPE_DOUBLE,
+    'BOOL': FieldType.TYPE_BOOL,
+    'DATE': FieldType.TYPE_INT32,       # days since epoch
+    'TIMESTAMP': FieldType.TYPE_INT64,  # microseconds since epoch
+}
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+EPOCH_DATE = date(1970, 1, 1)
+
+
+def setup_logging():
+    """Setup logging"""
+    import logging
+    
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    log_file = LOG_DIR / f"migrate_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file),
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+    
+    return logging.getLogger(__name__)
+
+
+def build_row_message(bq_types, columns):
+    """
+    Build a proto2 message class matching the table columns
+    
+    Returns:
+        tuple: (message class, DescriptorProto for the stream's writer schema)
+    """
+    descriptor = descriptor_pb2.DescriptorProto(name='Row')
+    for number, ((name, _), bq_type) in enumerate(zip(columns, bq_types), start=1):
+        descriptor.field.add(
+            name=name,
+            number=number,
+            type=BQ_TO_PROTO.get(bq_type, FieldType.TYPE_STRING),
+            label=FieldType.LABEL_OPTIONAL  # unset field → NULL
+        )
+    
+    file_proto = descriptor_pb2.FileDescriptorProto(name='row.proto')
+    file_proto.message_type.add().CopyFrom(descriptor)
+    pool = descriptor_pool.DescriptorPool()
+    pool.Add(file_proto)
+    
+    return message_factory.GetMessageClass(pool.FindMessageTypeByName('Row')), descriptor
+
+
+def to_proto_value(value, bq_type):
+    """Convert a psycopg2 value to what the proto field expects"""
+    if bq_type == 'TIMESTAMP':
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return (value - EPOCH) // timedelta(microseconds=1)
+    if bq_type == 'DATE':
+        return (value - EPOCH_DATE).days
+    if bq_type in BQ_TO_PROTO:
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+    if bq_type == 'BIGNUMERIC' and value.is_finite():
+        # BIGNUMERIC holds 38 fractional digits, as in the Parquet export
+        value = value.quantize(NUMERIC_QUANTUM, context=NUMERIC_CONTEXT)
+    return value if isinstance(value, str) else str(value)
+
+
+def prepare_staging(client, staging_ref, fields):
+    """(Re)create an empty staging table, dropping leftovers of a failed run"""
+    client.delete_table(staging_ref, not_found_ok=True)
+    client.create_table(bigquery.Table(staging_ref, schema=fields))
+
+
+def swap_into_place(client, staging_ref, table_ref):
+    """Replace the destination table with the staging table (atomic copy job)"""
+    client.copy_table(
+        staging_ref, table_ref,
+        job_config=bigquery.CopyJobConfig(write_disposition=bigquery.WriteDisposition.WRITE_TRUNCATE)
+    ).result()
+    client.delete_table(staging_ref, not_found_ok=True)
+
+
+def close_stream(append_stream):
+    """Close an AppendRowsStream (close() raises if it never opened or already closed)"""
+    if append_stream is not None and append_stream.is_active:
+        append_stream.close()
+
+
+def send_rows(append_stream, in_flight, proto_rows, offset):
+    """Send one AppendRows request, waiting on the oldest once MAX_IN_FLIGHT are pending"""
+    request = types.AppendRowsRequest(
+        offset=offset,
+        proto_rows=types.AppendRowsRequest.ProtoData(rows=proto_rows)
+    )
+    in_flight.append(append_stream.send(request))
+    while len(in_flight) > MAX_IN_FLIGHT:
+        in_flight.popleft().result()
+
+
+def migrate_table(schema, table, logger=None):
+    """
+    Stream a PostgreSQL table into BigQuery through a PENDING write stream
+    
+    Args:
+        schema: PostgreSQL schema (e.g., 'raw'), mapped via SCHEMA_MAPPING
+        table: Table name (e.g., 'csv_customers')
+        logger: Logger instance
+    
+    Returns:
+        dict: Migration results
+    """
+    if logger is None:
+        logger = setup_logging()
+    
+    dataset_id = SCHEMA_MAPPING.get(schema)
+    if not dataset_id:
+        logger.error(f"❌ Unknown schema: {schema}")
+        return {'success': False, 'schema': schema, 'table': table, 'error': 'Unknown schema'}
+    
+    table_ref = f"{GCP_PROJECT_ID}.{dataset_id}.{table}"
+    staging_table = f"{table}{STAGING_SUFFIX}"
+    staging_ref = f"{GCP_PROJECT_ID}.{dataset_id}.{staging_table}"
+    
+    logger.info(f"{'='*60}")
+    logger.info(f"Migrating: {schema}.{table} → {table_ref}")
+    logger.info(f"{'='*60}")
+    
+    conn = append_stream = None
+    try:
+        conn = get_postgres_connection()
+        
+        info = get_table_info(conn, schema, table)
+        if info is None:
+            logger.error(f"❌ Table {schema}.{table} does not exist")
+            return {'success': False, 'schema': schema, 'table': table, 'error': 'Table does not exist'}
+        
+        columns = info['columns']
+        bq_types = bigquery_types(columns, info['numeric_columns'])
+        fields = [bigquery.SchemaField(name, bq_type) for (name, _), bq_type in zip(columns, bq_types)]
+        
+        client = get_bigquery_client()
+        prepare_staging(client, staging_ref, fields)
+        
+        # Open a PENDING stream: rows stay invisible until the batch commit
+        write_client = bigquery_storage_v1.BigQueryWriteClient()
+        parent = write_client.table_path(GCP_PROJECT_ID, dataset_id, staging_table)
+        write_stream = write_client.create_write_stream(
+            parent=parent,
+            write_stream=types.WriteStream(type_=types.WriteStream.Type.PENDING)
+        )
+        
+        row_class, descriptor = build_row_message(bq_types, columns)
+        request_template = types.AppendRowsRequest(
+            write_stream=write_stream.name,
+            proto_rows=types.AppendRowsRequest.ProtoData(
+                writer_schema=types.ProtoSchema(proto_descriptor=descriptor)
+            )
+        )
+        append_stream = writer.AppendRowsStream(write_client, request_template)
+        
+        # Stream cursor batches into AppendRows requests of at most
+        # APPEND_MAX_BYTES, with at most MAX_IN_FLIGHT awaiting a response
+        in_flight = deque()
+        proto_rows, batch_bytes, sent = types.ProtoRows(), 0, 0
+        row_count = 0
+        with conn.cursor(name=f'migrate_{table}') as cursor:
+            cursor.itersize = FETCH_ROWS
+            cursor.execute(sql.SQL("SELECT * FROM {}").format(sql.Identifier(schema, table)))
+            
+            rows = cursor.fetchmany(FETCH_ROWS)
+            while rows:
+                for row in rows:
+                    message = row_class()
+                    for (name, _), bq_type, value in zip(columns, bq_types, row):
+                        if value is not None:
+                            setattr(message, name, to_proto_value(value, bq_type))
+                    serialized = message.SerializeToString()
+                    
+                    if proto_rows.serialized_rows and batch_bytes + len(serialized) > APPEND_MAX_BYTES:
+                        send_rows(append_stream, in_flight, proto_rows, sent)
+                        sent = row_count
+                        proto_rows, batch_bytes = types.ProtoRows(), 0
+                    
+                    proto_rows.serialized_rows.append(serialized)
+                    batch_bytes += len(serialized)
+                    row_count += 1
+                rows = cursor.fetchmany(FETCH_ROWS)
+            
+            if proto_rows.serialized_rows:
+                send_rows(append_stream, in_flight, proto_rows, sent)
+        
+        conn.close()
+        
+        for future in in_flight:
+            future.result()
+        close_stream(append_stream)
+        
+        # Finalize and commit: all rows become visible in the staging table at once
+        write_client.finalize_write_stream(name=write_stream.name)
+        commit = write_client.batch_commit_write_streams(
+            types.BatchCommitWriteStreamsRequest(parent=parent, write_streams=[write_stream.name])
+        )
+        if commit.stream_errors:
+            raise RuntimeError(f"Commit failed: {list(commit.stream_errors)}")
+        
+        # Only now is the live table replaced
+        swap_into_place(client, staging_ref, table_ref)
+        
+        logger.info(f"✅ SUCCESS: {row_count:,} rows committed to {table_ref}")
+        logger.info(f"{'='*60}\n")
+        
+        return {
+            'success': True,
+            'schema': schema,
+            'table': table,
+            'table_ref': table_ref,
+            'row_count': row_count
+        }
+    
+    except Exception as e:
+        logger.error(f"❌ FAILED: {schema}.{table}")
+        logger.error(f"   Error: {str(e)}")
+        logger.error(f"{'='*60}\n")
+        
+        return {
+            'success': False,
+            'schema': schema,
+            'table': table,
+            'error': str(e)
+        }
+    
+    finally:
+        close_stream(append_stream)
+        if conn is not None:
+            conn.close()
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description='Stream PostgreSQL tables into BigQuery (Storage Write API)'
+    )
+    parser.add_argument(
+        '--table',
+        help='Table to migrate in format schema.table (e.g., raw.csv_customers)'
+    )
+    parser.add_argument(
+        '--schema',
+        help='Migrate all tables from a specific schema'
+    )
+    
+    args = parser.parse_args()
+    
+    logger = setup_logging()
+    
+    if args.schema:
+        if args.schema not in TABLES_TO_EXTRACT:
+            logger.error(f"❌ Unknown schema: {args.schema}")
+            logger.error(f"   Available schemas: {list(TABLES_TO_EXTRACT.keys())}")
+            sys.exit(1)
+        
+        results = [migrate_table(args.schema, table, logger) for table in TABLES_TO_EXTRACT[args.schema]]
+    
+    elif args.table:
+        if '.' not in args.table:
+            logger.error("❌ Table must be in format schema.table")
+            logger.error("   Example: raw.csv_customers")
+            sys.exit(1)
+        
+        schema, table = args.table.split('.', 1)
+        results = [migrate_table(schema, table, logger)]
+    
+    else:
+        parser.print_help()
+        sys.exit(0)
+    
+    if all(r['success'] for r in results):
+        logger.info("\n✅ All migrations completed successfully")
+        sys.exit(0)
+    else:
+        logger.error("\n❌ Some migrations failed")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
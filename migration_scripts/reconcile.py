@@ -10,18 +10,26 @@ Validates that data migration was successful by comparing:
 
 Usage:
     python reconcile.py --table raw.csv_customers --bq-table raw_data.csv_customers
-    python reconcile.py --all  # Reconcile all tables
+    python reconcile.py --all  # Reconcile all tables (estimated PostgreSQL row counts)
+    python reconcile.py --all --exact-count  # Same, with exact COUNT(*)
 """
 
-import psycopg2
+import contextlib
+import functools
+import io
+import logging
+import subprocess
 import sys
+import threading
+import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
-from google.cloud import bigquery
+from psycopg2 import sql
+from psycopg2.pool import ThreadedConnectionPool
 from dotenv import load_dotenv
 import os
-from tabulate import tabulate
 
 # Load environment variables
 load_dotenv()
@@ -32,11 +40,20 @@ POSTGRES_CONFIG = {
     'port': int(os.getenv('POSTGRES_PORT', '5432')),
     'database': os.getenv('POSTGRES_DB', 'customer360'),
     'user': os.getenv('POSTGRES_USER', 'postgres'),
-    'password': os.getenv('POSTGRES_PASSWORD', '2003')
+    'password': os.getenv('POSTGRES_PASSWORD', '2003'),
+    # Fail fast instead of blocking forever on a dead or stalled connection:
+    # TCP keepalives, unacknowledged data times out after 15 s, and no
+    # statement runs longer than POSTGRES_STATEMENT_TIMEOUT_MS (exact
+    # COUNT(*) on very large tables may need a higher value)
+    'keepalives': 1,
+    'keepalives_idle': 30,
+    'keepalives_interval': 10,
+    'keepalives_count': 3,
+    'tcp_user_timeout': 15000,
+    'options': f"-c statement_timeout={os.getenv('POSTGRES_STATEMENT_TIMEOUT_MS', '60000')}"
 }
 
-# BigQuery configuration
-GCP_PROJECT_ID = os.getenv('GCP_PROJECT_ID') or os.popen('gcloud config get-value project').read().strip()
+# BigQuery project: GCP_PROJECT_ID, else the gcloud default - see _resolve_project()
 
 # Table mappings
 TABLE_MAPPINGS = {
@@ -44,6 +61,23 @@ TABLE_MAPPINGS = {
     # Add more mappings as you migrate more tables
 }
 
+# Row count, schema and sample checks run side by side for each table
+CHECKS_PER_TABLE = 3
+
+# Tables reconciled concurrently with --all
+MAX_WORKERS = 8
+
+# Estimated row counts (pg_class.reltuples, used by --all unless
+# --exact-count) are accepted when within this fraction of the BigQuery
+# count; anything further off is re-checked with COUNT(*) before failing
+ROW_COUNT_TOLERANCE = 0.01
+
+# BigQuery table metadata (schema, num_rows) is reused for this many seconds
+BQ_TABLE_CACHE_TTL = 300
+_BQ_TABLE_CACHE = {}   # table_ref → (expiry, Table)
+_BQ_TABLE_LOCKS = {}   # table_ref → Lock, so concurrent checks share one fetch
+_BQ_TABLE_LOCKS_LOCK = threading.Lock()
+
 # Output
 LOG_DIR = Path('logs')
 LOG_DIR.mkdir(exist_ok=True)
@@ -67,88 +101,155 @@ def setup_logging():
     return logging.getLogger(__name__)
 
 
-def get_postgres_connection():
-    """Get PostgreSQL connection"""
+def get_postgres_pool(maxconn):
+    """Get a PostgreSQL connection pool (connections are opened on demand)"""
     try:
-        conn = psycopg2.connect(**POSTGRES_CONFIG)
-        return conn
+        return ThreadedConnectionPool(1, maxconn, **POSTGRES_CONFIG)
     except Exception as e:
         print(f"❌ Failed to connect to PostgreSQL: {e}")
         sys.exit(1)
 
 
+@contextlib.contextmanager
+def pooled_connection(pool):
+    """Borrow a connection from the pool"""
+    conn = pool.getconn()
+    try:
+        # Autocommit: a failed check must not leave the connection in an
+        # aborted transaction for the next borrower
+        conn.autocommit = True
+        yield conn
+    finally:
+        pool.putconn(conn)
+
+
+@functools.lru_cache(maxsize=1)
+def _resolve_project():
+    """GCP project ID, looked up once and only when BigQuery is first used"""
+    project = os.getenv('GCP_PROJECT_ID')
+    if project:
+        return project
+    
+    try:
+        result = subprocess.run(
+            ['gcloud', 'config', 'get-value', 'project'],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=30
+        )
+        return result.stdout.strip()
+    except Exception as e:
+        print(f"❌ GCP_PROJECT_ID not found in .env or gcloud config: {e}")
+        sys.exit(1)
+
+
+@functools.lru_cache(maxsize=1)
 def get_bigquery_client():
-    """Get BigQuery client"""
+    """Get BigQuery client (created once, then shared by every check)"""
+    # Imported here: google.cloud.bigquery is slow to import and not
+    # needed for --help or argument errors
+    from google.cloud import bigquery
+    
     try:
-        return bigquery.Client(project=GCP_PROJECT_ID)
+        return bigquery.Client(project=_resolve_project())
     except Exception as e:
         print(f"❌ Failed to create BigQuery client: {e}")
         sys.exit(1)
 
 
-def get_postgres_row_count(schema, table):
-    """Get row count from PostgreSQL table"""
-    conn = get_postgres_connection()
-    cursor = conn.cursor()
+def get_postgres_stats(conn, schema, table, limit=3, exact_count=True):
+    """
+    Get row count, schema and sample rows of a PostgreSQL table in one query
     
-    query = f"SELECT COUNT(*) FROM {schema}.{table}"
-    cursor.execute(query)
-    count = cursor.fetchone()[0]
+    Args:
+        exact_count: COUNT(*) (full scan) if True, else the planner estimate
+            from pg_class.reltuples (catalog lookup; -1 if never analyzed)
     
-    cursor.close()
-    conn.close()
+    Returns:
+        dict: 'row_count', 'row_count_exact', 'schema' (column list)
+            and 'sample' ((columns, rows))
+    """
+    table_name = sql.Identifier(schema, table)
     
-    return count
+    if exact_count:
+        count_query = sql.SQL("SELECT COUNT(*) AS n FROM {}").format(table_name)
+        params = ()
+    else:
+        count_query = sql.SQL("SELECT reltuples::bigint AS n FROM pg_class WHERE oid = to_regclass(%s)")
+        params = (table_name.as_string(conn),)
+    
+    query = sql.SQL("""
+        WITH row_count AS (
+            {count_query}
+        ),
+        columns AS (
+            SELECT json_agg(json_build_object(
+                       'name', column_name,
+                       'type', data_type,
+                       'nullable', is_nullable = 'YES'
+                   ) ORDER BY ordinal_position) AS j
+            FROM information_schema.columns
+            WHERE table_schema = %s
+              AND table_name = %s
+        ),
+        sample AS (
+            SELECT json_agg(row_to_json(s)) AS j
+            FROM (SELECT * FROM {table_name} LIMIT %s) s
+        )
+        SELECT (SELECT n FROM row_count), (SELECT j FROM columns), (SELECT j FROM sample)
+    """).format(count_query=count_query, table_name=table_name)
+    
+    with conn.cursor() as cursor:
+        cursor.execute(query, params + (schema, table, limit))
+        row_count, columns, sample = cursor.fetchone()
+    
+    columns = columns or []
+    names = [col['name'] for col in columns]
+    
+    return {
+        'row_count': row_count,
+        'row_count_exact': exact_count,
+        'schema': columns,
+        'sample': (names, [[row[name] for name in names] for row in sample or []])
+    }
 
 
-def get_bigquery_row_count(dataset, table):
-    """Get row count from BigQuery table"""
-    client = get_bigquery_client()
-    
-    query = f"SELECT COUNT(*) as count FROM `{GCP_PROJECT_ID}.{dataset}.{table}`"
-    result = client.query(query).to_dataframe()
-    
-    return int(result['count'][0])
+def get_postgres_row_count(conn, schema, table):
+    """Exact row count of a PostgreSQL table (full scan)"""
+    with conn.cursor() as cursor:
+        cursor.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(sql.Identifier(schema, table)))
+        return cursor.fetchone()[0]
 
 
-def get_postgres_schema(schema, table):
-    """Get schema from PostgreSQL table"""
-    conn = get_postgres_connection()
-    cursor = conn.cursor()
-    
-    query = """
-        SELECT 
-            column_name,
-            data_type,
-            is_nullable
-        FROM information_schema.columns
-        WHERE table_schema = %s
-          AND table_name = %s
-        ORDER BY ordinal_position
-    """
-    
-    cursor.execute(query, (schema, table))
-    columns = cursor.fetchall()
-    
-    cursor.close()
-    conn.close()
+def get_bigquery_table(table_ref):
+    """Get BigQuery table metadata, cached for BQ_TABLE_CACHE_TTL seconds"""
+    with _BQ_TABLE_LOCKS_LOCK:
+        lock = _BQ_TABLE_LOCKS.setdefault(table_ref, threading.Lock())
     
-    return [
-        {
-            'name': col[0],
-            'type': col[1],
-            'nullable': col[2] == 'YES'
-        }
-        for col in columns
-    ]
+    with lock:
+        cached = _BQ_TABLE_CACHE.get(table_ref)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        
+        table_obj = get_bigquery_client().get_table(table_ref)
+        _BQ_TABLE_CACHE[table_ref] = (time.monotonic() + BQ_TABLE_CACHE_TTL, table_obj)
+        return table_obj
+
+
+def invalidate_bigquery_table(table_ref):
+    """Drop cached metadata for a table (call after DDL or a reload)"""
+    _BQ_TABLE_CACHE.pop(table_ref, None)
+
+
+def get_bigquery_row_count(dataset, table):
+    """Get row count from BigQuery table metadata (no query is run or billed)"""
+    return get_bigquery_table(f"{_resolve_project()}.{dataset}.{table}").num_rows
 
 
 def get_bigquery_schema(dataset, table):
     """Get schema from BigQuery table"""
-    client = get_bigquery_client()
-    
-    table_ref = f"{GCP_PROJECT_ID}.{dataset}.{table}"
-    table_obj = client.get_table(table_ref)
+    table_obj = get_bigquery_table(f"{_resolve_project()}.{dataset}.{table}")
     
     return [
         {
@@ -160,46 +261,153 @@ def get_bigquery_schema(dataset, table):
     ]
 
 
-def get_postgres_sample(schema, table, limit=5):
-    """Get sample data from PostgreSQL"""
-    conn = get_postgres_connection()
-    cursor = conn.cursor()
+def get_bigquery_sample(dataset, table, limit=5):
+    """Get sample data from BigQuery (tabledata.list: no query job, not billed)"""
+    table_obj = get_bigquery_table(f"{_resolve_project()}.{dataset}.{table}")
+    rows = get_bigquery_client().list_rows(table_obj, max_results=limit)
+    
+    return [field.name for field in table_obj.schema], [list(row.values()) for row in rows]
+
+
+class ReportBuffer:
+    """Collects one table's report lines so they are logged as one record"""
     
-    query = f"SELECT * FROM {schema}.{table} LIMIT {limit}"
-    cursor.execute(query)
+    def __init__(self):
+        self.buffer = io.StringIO()
+        self.level = logging.INFO
     
-    rows = cursor.fetchall()
-    columns = [desc[0] for desc in cursor.description]
+    def _write(self, level, message):
+        self.buffer.write(f"{message}\n")
+        self.level = max(self.level, level)
     
-    cursor.close()
-    conn.close()
+    def info(self, message):
+        self._write(logging.INFO, message)
     
-    return columns, rows
+    def warning(self, message):
+        self._write(logging.WARNING, message)
+    
+    def error(self, message):
+        self._write(logging.ERROR, message)
+    
+    def emit(self, logger):
+        logger.log(self.level, self.buffer.getvalue().rstrip('\n'))
 
 
-def get_bigquery_sample(dataset, table, limit=5):
-    """Get sample data from BigQuery"""
-    client = get_bigquery_client()
+def _fetch_postgres_stats(pool, schema, table, exact_count):
+    """Run the PostgreSQL side of all checks on one pooled connection"""
+    with pooled_connection(pool) as conn:
+        return get_postgres_stats(conn, schema, table, exact_count=exact_count)
+
+
+def _check_row_count(postgres, bq_dataset, bq_table, pool, pg_schema, pg_table):
+    """
+    Row counts on both sides
+    
+    An estimate that is missing (table never analyzed) or outside
+    ROW_COUNT_TOLERANCE is never trusted to fail a table: it is
+    re-checked with COUNT(*) first.
+    """
+    bq_count = get_bigquery_row_count(bq_dataset, bq_table)
+    stats = postgres.result()
+    pg_count, exact = stats['row_count'], stats['row_count_exact']
+    
+    if not exact and (pg_count < 0 or abs(bq_count - pg_count) > ROW_COUNT_TOLERANCE * max(pg_count, bq_count)):
+        with pooled_connection(pool) as conn:
+            pg_count = get_postgres_row_count(conn, pg_schema, pg_table)
+        exact = True
+    
+    match = pg_count == bq_count if exact else True
+    
+    return {
+        'postgres': pg_count,
+        'bigquery': bq_count,
+        'exact': exact,
+        'match': match
+    }
+
+
+def _check_schema(postgres, bq_dataset, bq_table):
+    """Column names on both sides"""
+    bq_schema_info = get_bigquery_schema(bq_dataset, bq_table)
+    pg_schema_info = postgres.result()['schema']
     
-    query = f"SELECT * FROM `{GCP_PROJECT_ID}.{dataset}.{table}` LIMIT {limit}"
-    df = client.query(query).to_dataframe()
+    pg_columns = [col['name'] for col in pg_schema_info]
+    bq_columns = [col['name'] for col in bq_schema_info]
     
-    return df.columns.tolist(), df.values.tolist()
+    return {
+        'postgres_columns': len(pg_columns),
+        'bigquery_columns': len(bq_columns),
+        'match': len(pg_columns) == len(bq_columns),
+        'missing_in_bq': list(set(pg_columns) - set(bq_columns)),
+        'extra_in_bq': list(set(bq_columns) - set(pg_columns))
+    }
+
+
+def _check_sample(postgres, bq_dataset, bq_table):
+    """First rows on both sides, as (columns, rows) pairs"""
+    bq_sample = get_bigquery_sample(bq_dataset, bq_table, limit=3)
+    
+    return postgres.result()['sample'], bq_sample
 
 
-def reconcile_table(pg_schema, pg_table, bq_dataset, bq_table, logger=None):
+def reconcile_table(pg_schema, pg_table, bq_dataset, bq_table, logger=None, pool=None,
+                    exact_count=True, pretty=False):
     """
     Reconcile a single table between PostgreSQL and BigQuery
     
+    The PostgreSQL side of all checks is a single query on one pooled
+    connection; it runs concurrently with the three BigQuery lookups.
+    The output is logged in order once everything is done.
+    
+    Args:
+        pool: PostgreSQL connection pool to reuse (default: a pool for this table)
+        exact_count: Compare COUNT(*) (default) or the pg_class estimate,
+            accepted within ROW_COUNT_TOLERANCE (re-checked exactly otherwise)
+        pretty: Draw sample previews as grids instead of plain aligned text
+    
     Returns:
         dict: Reconciliation results
     """
     if logger is None:
         logger = setup_logging()
     
-    logger.info(f"\n{'='*80}")
-    logger.info(f"RECONCILING: {pg_schema}.{pg_table} → {bq_dataset}.{bq_table}")
-    logger.info(f"{'='*80}")
+    owns_pool = pool is None
+    if owns_pool:
+        pool = get_postgres_pool(1)
+    
+    try:
+        # One worker for the PostgreSQL query plus one per check
+        with ThreadPoolExecutor(max_workers=CHECKS_PER_TABLE + 1) as executor:
+            postgres = executor.submit(_fetch_postgres_stats, pool, pg_schema, pg_table, exact_count)
+            row_count = executor.submit(_check_row_count, postgres, bq_dataset, bq_table,
+                                        pool, pg_schema, pg_table)
+            schema = executor.submit(_check_schema, postgres, bq_dataset, bq_table)
+            sample = executor.submit(_check_sample, postgres, bq_dataset, bq_table)
+            wait([row_count, schema, sample])
+        
+        return _report_table(row_count, schema, sample, pg_schema, pg_table, bq_dataset, bq_table,
+                             logger, pretty)
+    finally:
+        if owns_pool:
+            pool.closeall()
+
+
+def _report_table(row_count, schema, sample, pg_schema, pg_table, bq_dataset, bq_table, logger,
+                  pretty=False):
+    """
+    Log the outcome of the three check futures and build the results dict
+    
+    The whole report is buffered and logged as a single record, at the
+    most severe level seen, so parallel tables never interleave.
+    """
+    from tabulate import tabulate
+    
+    report = ReportBuffer()
+    tablefmt = 'grid' if pretty else 'plain'  # plain: no box drawing
+    
+    report.info(f"\n{'='*80}")
+    report.info(f"RECONCILING: {pg_schema}.{pg_table} → {bq_dataset}.{bq_table}")
+    report.info(f"{'='*80}")
     
     results = {
         'pg_table': f"{pg_schema}.{pg_table}",
@@ -208,114 +416,98 @@ def reconcile_table(pg_schema, pg_table, bq_dataset, bq_table, logger=None):
     }
     
     # 1. ROW COUNT
-    logger.info("\n1. ROW COUNT COMPARISON")
-    logger.info("-" * 40)
+    report.info("\n1. ROW COUNT COMPARISON")
+    report.info("-" * 40)
     
     try:
-        pg_count = get_postgres_row_count(pg_schema, pg_table)
-        bq_count = get_bigquery_row_count(bq_dataset, bq_table)
+        check = row_count.result()
+        pg_count, bq_count = check['postgres'], check['bigquery']
         
-        match = pg_count == bq_count
-        status = "✅ MATCH" if match else "❌ MISMATCH"
+        status = "✅ MATCH" if check['match'] else "❌ MISMATCH"
         
-        logger.info(f"PostgreSQL: {pg_count:,} rows")
-        logger.info(f"BigQuery:   {bq_count:,} rows")
-        logger.info(f"Status:     {status}")
+        if check['exact']:
+            report.info(f"PostgreSQL: {pg_count:,} rows")
+        else:
+            report.info(f"PostgreSQL: ~{pg_count:,} rows (estimate, ±{ROW_COUNT_TOLERANCE:.0%} allowed)")
+        report.info(f"BigQuery:   {bq_count:,} rows")
+        report.info(f"Status:     {status}")
         
-        if not match:
+        if not check['match']:
             diff = bq_count - pg_count
-            logger.error(f"⚠️  Difference: {diff:+,} rows")
+            report.error(f"⚠️  Difference: {diff:+,} rows")
         
-        results['checks']['row_count'] = {
-            'postgres': pg_count,
-            'bigquery': bq_count,
-            'match': match
-        }
+        results['checks']['row_count'] = check
         
     except Exception as e:
-        logger.error(f"❌ Row count check failed: {e}")
+        report.error(f"❌ Row count check failed: {e}")
         results['checks']['row_count'] = {'error': str(e)}
     
     # 2. SCHEMA COMPARISON
-    logger.info("\n2. SCHEMA COMPARISON")
-    logger.info("-" * 40)
+    report.info("\n2. SCHEMA COMPARISON")
+    report.info("-" * 40)
     
     try:
-        pg_schema_info = get_postgres_schema(pg_schema, pg_table)
-        bq_schema_info = get_bigquery_schema(bq_dataset, bq_table)
+        check = schema.result()
         
-        pg_columns = [col['name'] for col in pg_schema_info]
-        bq_columns = [col['name'] for col in bq_schema_info]
-        
-        logger.info(f"PostgreSQL: {len(pg_columns)} columns")
-        logger.info(f"BigQuery:   {len(bq_columns)} columns")
+        report.info(f"PostgreSQL: {check['postgres_columns']} columns")
+        report.info(f"BigQuery:   {check['bigquery_columns']} columns")
         
         # Column name comparison
-        missing_in_bq = set(pg_columns) - set(bq_columns)
-        extra_in_bq = set(bq_columns) - set(pg_columns)
-        
-        if missing_in_bq:
-            logger.error(f"❌ Missing in BigQuery: {missing_in_bq}")
+        if check['missing_in_bq']:
+            report.error(f"❌ Missing in BigQuery: {set(check['missing_in_bq'])}")
         
-        if extra_in_bq:
-            logger.warning(f"⚠️  Extra in BigQuery: {extra_in_bq}")
+        if check['extra_in_bq']:
+            report.warning(f"⚠️  Extra in BigQuery: {set(check['extra_in_bq'])}")
         
-        if not missing_in_bq and not extra_in_bq:
-            logger.info("✅ All column names match")
+        if not check['missing_in_bq'] and not check['extra_in_bq']:
+            report.info("✅ All column names match")
         
-        results['checks']['schema'] = {
-            'postgres_columns': len(pg_columns),
-            'bigquery_columns': len(bq_columns),
-            'match': len(pg_columns) == len(bq_columns),
-            'missing_in_bq': list(missing_in_bq),
-            'extra_in_bq': list(extra_in_bq)
-        }
+        results['checks']['schema'] = check
         
     except Exception as e:
-        logger.error(f"❌ Schema check failed: {e}")
+        report.error(f"❌ Schema check failed: {e}")
         results['checks']['schema'] = {'error': str(e)}
     
     # 3. SAMPLE DATA
-    logger.info("\n3. SAMPLE DATA PREVIEW")
-    logger.info("-" * 40)
+    report.info("\n3. SAMPLE DATA PREVIEW")
+    report.info("-" * 40)
     
     try:
-        pg_cols, pg_rows = get_postgres_sample(pg_schema, pg_table, limit=3)
-        bq_cols, bq_rows = get_bigquery_sample(bq_dataset, bq_table, limit=3)
+        (pg_cols, pg_rows), (bq_cols, bq_rows) = sample.result()
         
-        logger.info("PostgreSQL sample (first 3 rows):")
-        logger.info(tabulate(pg_rows, headers=pg_cols, tablefmt='grid'))
+        report.info("PostgreSQL sample (first 3 rows):")
+        report.info(tabulate(pg_rows, headers=pg_cols, tablefmt=tablefmt))
         
-        logger.info("\nBigQuery sample (first 3 rows):")
-        logger.info(tabulate(bq_rows, headers=bq_cols, tablefmt='grid'))
+        report.info("\nBigQuery sample (first 3 rows):")
+        report.info(tabulate(bq_rows, headers=bq_cols, tablefmt=tablefmt))
         
         results['checks']['sample_data'] = {
             'retrieved': True
         }
         
     except Exception as e:
-        logger.warning(f"⚠️  Sample data check failed: {e}")
+        report.warning(f"⚠️  Sample data check failed: {e}")
         results['checks']['sample_data'] = {'error': str(e)}
     
     # SUMMARY
-    logger.info(f"\n{'='*80}")
-    logger.info("RECONCILIATION SUMMARY")
-    logger.info(f"{'='*80}")
-    
-    all_passed = all(
-        check.get('match', False) 
-        for check in results['checks'].values() 
-        if 'match' in check
-    )
+    report.info(f"\n{'='*80}")
+    report.info("RECONCILIATION SUMMARY")
+    report.info(f"{'='*80}")
+    
+    # A check that errored is a failure, not a silent pass
+    checks = results['checks'].values()
+    has_error = any('error' in check for check in checks)
+    all_passed = not has_error and all(check['match'] for check in checks if 'match' in check)
+    
+    results['overall_status'] = 'PASS' if all_passed else 'FAIL'
     
     if all_passed:
-        logger.info("✅ ALL CHECKS PASSED - Migration successful!")
-        results['overall_status'] = 'PASS'
+        report.info("✅ ALL CHECKS PASSED - Migration successful!")
     else:
-        logger.error("❌ SOME CHECKS FAILED - Review issues above")
-        results['overall_status'] = 'FAIL'
+        report.error("❌ SOME CHECKS FAILED - Review issues above")
     
-    logger.info(f"{'='*80}\n")
+    report.info(f"{'='*80}\n")
+    report.emit(logger)
     
     return results
 
@@ -338,9 +530,24 @@ def main():
         action='store_true',
         help='Reconcile all mapped tables'
     )
+    parser.add_argument(
+        '--exact-count',
+        action='store_true',
+        help='With --all, compare exact COUNT(*) instead of the PostgreSQL row estimate'
+    )
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Draw sample data previews as grids'
+    )
     
     args = parser.parse_args()
     
+    # Nothing to do: show usage before anything resolves the GCP project
+    if not ((args.table and args.bq_table) or args.all):
+        parser.print_help()
+        sys.exit(0)
+    
     # Setup logging
     logger = setup_logging()
     
@@ -349,31 +556,39 @@ def main():
     logger.info("="*80)
     logger.info(f"Start time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     logger.info(f"PostgreSQL: {POSTGRES_CONFIG['host']}:{POSTGRES_CONFIG['port']}/{POSTGRES_CONFIG['database']}")
-    logger.info(f"BigQuery:   {GCP_PROJECT_ID}")
+    logger.info(f"BigQuery:   {_resolve_project()}")
     logger.info("="*80)
     
     results_list = []
     
+    # One connection per table being reconciled at a time
+    workers = max(1, min(MAX_WORKERS, len(TABLE_MAPPINGS))) if args.all else 1
+    pool = get_postgres_pool(workers)
+    
     if args.table and args.bq_table:
         # Reconcile single table
         pg_schema, pg_table = args.table.split('.', 1)
         bq_dataset, bq_table = args.bq_table.split('.', 1)
         
-        result = reconcile_table(pg_schema, pg_table, bq_dataset, bq_table, logger)
+        result = reconcile_table(pg_schema, pg_table, bq_dataset, bq_table, logger, pool=pool,
+                                 pretty=args.pretty)
         results_list.append(result)
         
-    elif args.all:
-        # Reconcile all mapped tables
-        for pg_full, bq_full in TABLE_MAPPINGS.items():
+    else:
+        # Reconcile all mapped tables in parallel
+        def reconcile_mapping(mapping):
+            pg_full, bq_full = mapping
             pg_schema, pg_table = pg_full.split('.', 1)
             bq_dataset, bq_table = bq_full.split('.', 1)
             
-            result = reconcile_table(pg_schema, pg_table, bq_dataset, bq_table, logger)
-            results_list.append(result)
+            return reconcile_table(pg_schema, pg_table, bq_dataset, bq_table, logger,
+                                   pool=pool,
+                                   exact_count=args.exact_count, pretty=args.pretty)
         
-    else:
-        parser.print_help()
-        sys.exit(0)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results_list = list(executor.map(reconcile_mapping, TABLE_MAPPINGS.items()))
+    
+    pool.closeall()
     
     # Final summary
     logger.info("\n" + "="*80)
@@ -387,9 +602,18 @@ def main():
     logger.info(f"✅ Passed: {passed}")
     logger.info(f"❌ Failed: {failed}")
     
+    # Estimates only show the counts are close, not that no rows were lost
+    estimated = [r['pg_table'] for r in results_list
+                 if not r['checks'].get('row_count', {}).get('exact', True)]
+    
     if failed == 0:
         logger.info("\n🎉 ALL TABLES RECONCILED SUCCESSFULLY!")
-        logger.info("Migration validated - data integrity confirmed")
+        if estimated:
+            logger.warning(f"Row counts of {len(estimated)} table(s) were estimated: "
+                           f"{', '.join(estimated)}")
+            logger.warning("Re-run with --exact-count to confirm data integrity")
+        else:
+            logger.info("Migration validated - data integrity confirmed")
         sys.exit(0)
     else:
         logger.error("\n⚠️  SOME TABLES FAILED RECONCILIATION")
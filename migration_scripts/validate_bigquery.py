@@ -36,9 +36,8 @@ def validate_table(dataset, table, expected_rows=5000):
     # 2. Row count
     print("\n2. ROW COUNT")
     print("-" * 40)
-    query = f"SELECT COUNT(*) as count FROM `{table_ref}`"
-    result = client.query(query).to_dataframe()
-    actual_rows = int(result['count'][0])
+    # From the table metadata fetched above - no COUNT(*) query needed
+    actual_rows = table_obj.num_rows
     
     print(f"Expected: {expected_rows:,} rows")
     print(f"Actual:   {actual_rows:,} rows")
@@ -67,9 +66,13 @@ def validate_table(dataset, table, expected_rows=5000):
     # 5. Sample data
     print("\n5. SAMPLE DATA (first 3 rows)")
     print("-" * 40)
-    query = f"SELECT * FROM `{table_ref}` LIMIT 3"
-    df = client.query(query).to_dataframe()
-    print(tabulate(df, headers='keys', tablefmt='grid', showindex=False))
+    # Read the first rows directly (tabledata.list) - no billed query
+    rows = client.list_rows(table_obj, max_results=3)
+    print(tabulate(
+        [list(row.values()) for row in rows],
+        headers=[field.name for field in table_obj.schema],
+        tablefmt='grid'
+    ))
     
     # Summary
     print(f"\n{'='*60}")
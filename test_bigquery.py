@@ -11,9 +11,14 @@ query = """
         CURRENT_TIMESTAMP() as timestamp
 """
 
-# Exécuter la query
-result = client.query(query).to_dataframe()
+# Valider la query sans l'exécuter (dry run : auth + projet + syntaxe, aucun slot utilisé)
+job_config = bigquery.QueryJobConfig(dry_run=True, use_query_cache=False)
+job = client.query(query, job_config=job_config)
 
 # Afficher le résultat
+if job.total_bytes_processed is None:
+    raise SystemExit("❌ Dry run returned no statistics")
+
 print("\n🎉 SUCCESS! BigQuery connection works!\n")
-print(result)
+print(f"Project: {client.project}")
+print(f"Query validated (dry run, {job.total_bytes_processed} bytes would be processed)")
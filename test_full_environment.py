@@ -5,6 +5,7 @@ Tests all connections: PostgreSQL → Python → BigQuery
 
 import sys
 import os
+import importlib.util
 
 def test_imports():
     """Test that all required packages can be imported"""
@@ -19,21 +20,27 @@ def test_imports():
         'tqdm': 'Progress bars'
     }
     
+    # find_spec only locates each package - nothing is executed here;
+    # test_data_flow() imports and exercises them for real
     failed = []
     for package, description in packages.items():
         try:
-            __import__(package)
+            found = importlib.util.find_spec(package) is not None
+        except ImportError:  # parent package missing (e.g. google.cloud)
+            found = False
+        
+        if found:
             print(f"✅ {package:30} → {description}")
-        except ImportError as e:
-            print(f"❌ {package:30} → FAILED: {e}")
+        else:
+            print(f"❌ {package:30} → FAILED: not installed")
             failed.append(package)
     
     print()
     if failed:
-        print(f"❌ {len(failed)} package(s) failed to import")
+        print(f"❌ {len(failed)} package(s) not found")
         return False
     else:
-        print("✅ All packages imported successfully")
+        print("✅ All packages found")
         return True
 
 def test_postgresql():
@@ -44,16 +51,10 @@ def test_postgresql():
     print("=" * 60)
     
     try:
-        import psycopg2
+        from migration_scripts._pg import quick_connect
         
         # Try to connect
-        conn = psycopg2.connect(
-            host='localhost',
-            port=5432,  
-            database='customer360',
-            user='dataeng',
-            password='2003'  
-        )
+        conn = quick_connect()
         cursor = conn.cursor()
         
         # Simple query
@@ -84,9 +85,13 @@ def test_bigquery():
         # Initialize client
         client = bigquery.Client()
         
-        # Simple query
+        # Dry run: validates auth, project and syntax without running a job
         query = "SELECT 'Connected' as status"
-        result = client.query(query).to_dataframe()
+        job_config = bigquery.QueryJobConfig(dry_run=True, use_query_cache=False)
+        job = client.query(query, job_config=job_config)
+        
+        if job.total_bytes_processed is None:
+            raise RuntimeError("dry run returned no statistics")
         
         print(f"✅ BigQuery connection successful")
         print(f"   Project: {client.project}")
@@ -105,19 +110,13 @@ def test_data_flow():
     print("=" * 60)
     
     try:
-        import psycopg2
         import pandas as pd
         from google.cloud import bigquery
+        from migration_scripts._pg import quick_connect
         
         # Step 1: Extract from PostgreSQL
         print("Step 1: Extract from PostgreSQL...")
-        conn = psycopg2.connect(
-            host='localhost',
-            port=5432,
-            database='customer360',
-            user='dataeng',
-            password='2003'
-        )
+        conn = quick_connect()
         
         # Simple test query
         df = pd.read_sql("SELECT 1 as id, 'test' as name", conn)
@@ -6,17 +6,13 @@ Checks if we can connect to customer360 database
 import psycopg2
 import sys
 
+from migration_scripts._pg import DEFAULTS, quick_connect
+
 def test_postgres_connection():
     """Test connection to PostgreSQL database"""
     
-    # Connection parameters - ADJUST THESE!
-    conn_params = {
-        'host': 'localhost',
-        'port': 5432,  
-        'database': 'customer360',
-        'user': 'dataeng',  
-        'password': '2003'  
-    }
+    # Connection parameters - set POSTGRES_* in .env to adjust
+    conn_params = DEFAULTS
     
     print("=" * 60)
     print("Testing PostgreSQL Connection")
@@ -29,63 +25,46 @@ def test_postgres_connection():
     try:
         # Attempt connection
         print("Connecting to PostgreSQL...")
-        conn = psycopg2.connect(**conn_params)
+        conn = quick_connect()
         cursor = conn.cursor()
         
         # Test query
         print("✅ Connection successful!")
         print()
         
-        # Get PostgreSQL version
-        cursor.execute("SELECT version();")
-        version = cursor.fetchone()[0]
-        print(f"PostgreSQL version: {version[:50]}...")
-        print()
-        
-        # List databases
+        # Version, databases, schemas and raw tables in one round-trip
         cursor.execute("""
-            SELECT datname 
-            FROM pg_database 
-            WHERE datistemplate = false
-            ORDER BY datname;
+            SELECT
+                version(),
+                (SELECT array_agg(datname::text ORDER BY datname)
+                 FROM pg_database
+                 WHERE datistemplate = false),
+                EXISTS(
+                    SELECT 1 
+                    FROM pg_database 
+                    WHERE datname = 'customer360'
+                ),
+                (SELECT array_agg(schema_name::text ORDER BY schema_name)
+                 FROM information_schema.schemata
+                 WHERE schema_name IN ('raw', 'staging', 'warehouse')),
+                (SELECT array_agg(table_name::text ORDER BY table_name)
+                 FROM information_schema.tables
+                 WHERE table_schema = 'raw');
         """)
-        databases = cursor.fetchall()
-        print(f"Available databases: {[db[0] for db in databases]}")
+        version, databases, exists, schemas, tables = cursor.fetchone()
+        
+        print(f"PostgreSQL version: {version[:50]}...")
         print()
         
-        # Check if customer360 exists
-        cursor.execute("""
-            SELECT EXISTS(
-                SELECT 1 
-                FROM pg_database 
-                WHERE datname = 'customer360'
-            );
-        """)
-        exists = cursor.fetchone()[0]
+        print(f"Available databases: {databases or []}")
+        print()
         
         if exists:
             print("✅ Database 'customer360' exists!")
+            print(f"   Schemas found: {schemas or []}")
             
-            # Check schemas
-            cursor.execute("""
-                SELECT schema_name 
-                FROM information_schema.schemata
-                WHERE schema_name IN ('raw', 'staging', 'warehouse')
-                ORDER BY schema_name;
-            """)
-            schemas = cursor.fetchall()
-            print(f"   Schemas found: {[s[0] for s in schemas]}")
-            
-            # Check tables in raw schema
-            cursor.execute("""
-                SELECT table_name 
-                FROM information_schema.tables
-                WHERE table_schema = 'raw'
-                ORDER BY table_name;
-            """)
-            tables = cursor.fetchall()
             if tables:
-                print(f"   Tables in raw: {[t[0] for t in tables]}")
+                print(f"   Tables in raw: {tables}")
             else:
                 print("   ⚠️  No tables found in 'raw' schema")
         else:
@@ -121,7 +100,7 @@ def test_postgres_connection():
         print(f"   User: {conn_params['user']}")
         print()
         print("3. If using Docker container on port 5433:")
-        print("   Change conn_params['port'] = 5433")
+        print("   Set POSTGRES_PORT=5433 in .env")
         print()
         return False
         